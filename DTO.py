@@ -11,33 +11,21 @@ independent data stream.
 """
 import logging
 
-from MonitorControl import ClassInstance, Device, Observatory
-try:
-  from . import cfg
-except:
-  pass
-from MonitorControl import ClassInstance, Device, Observatory
-from MonitorControl.Antenna import Telescope
-from MonitorControl import MonitorControlError, Switch
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from MonitorControl import ClassInstance, Device, MonitorControlError, \
+                           Observatory, Switch
 from MonitorControl.Antenna import Telescope
-from MonitorControl.Configurations.GDSCC import cfg, make_switch_inputs
+from MonitorControl.Configurations.GDSCC import CHANNELS, lan_status, \
+                                                make_switch_inputs
 from MonitorControl.FrontEnds import FrontEnd
 from MonitorControl.FrontEnds.DSN import DSN_fe
 from MonitorControl.Receivers import Receiver
 from MonitorControl.Receivers.DSN import DSN_rx
-from support.network import LAN_hosts_status
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-up, down, IP, MAC, ROACHlist = LAN_hosts_status()
-n_roaches = len(ROACHlist)
-if n_roaches < 2:
-  logger.warning("Only %d ROACHes available", n_roaches)
-if n_roaches < 1:
-  raise ObservatoryError("", "Cannot proceed without ROACHes")
-roaches = ROACHlist[:2]
-
 def station_configuration(equipment,
                           roach_loglevel=logging.WARNING,
                           hardware={"sampling_clock": False,
@@ -54,70 +42,93 @@ def station_configuration(equipment,
   of 'DSN_fe' depends on this to know the band name.
   """
   print("DTO:", hardware)
+  up, down, IP, MAC, ROACHlist = lan_status()
+  n_roaches = len(ROACHlist)
+  if n_roaches < 2:
+    logger.warning("Only %d ROACHes available", n_roaches)
+  if n_roaches < 1:
+    raise MonitorControlError("", "Cannot proceed without ROACHes")
+  roaches = ROACHlist[:2]
   # Define the site
   obs = Observatory("GDSCC")
   tel = {}
   fe = {}
   rx = {}
-  # For each station at the site
-  for dss in list(cfg.keys()):
-    # define the telescope
-    tel[dss] = Telescope(obs, dss=dss)
-    # for each band available on the telescope
-    for band in list(cfg[dss].keys()):                         # S, X, Ka
-      logger.debug("station_configuration: processing band %s", dss)
-      fename = band+str(dss)
-      outnames = []
-      # for each polarization processed by the receiver
-      for polindex in range(len(list(cfg[dss][band].keys()))):
-        outnames.append(fename+list(cfg[dss][band].keys())[polindex])
-      fe[fename] = ClassInstance(FrontEnd, 
-                                 DSN_fe, 
-                                 fename,
-                                 inputs = {fename:
-                                           tel[dss].outputs[tel[dss].name]},
-                                 output_names = outnames)
-      rx_inputs = {}
-      rx_outnames = []
-      for outname in outnames:
-        rx_inputs[outname] = fe[fename].outputs[outname]
-        rx_outnames.append(outname+'U')
-      rx[fename] = ClassInstance(Receiver, 
-                                 DSN_rx, 
-                                 fename,
-                                 inputs = rx_inputs,
-                                 output_names = rx_outnames)
+  # For each receiver channel at the site, grouped by station and band
+  for (dss, band), channels in groupby(CHANNELS, key=lambda chl: chl[:2]):
+    if dss not in tel:
+      # define the telescope; its single output feeds every band
+      tel[dss] = Telescope(obs, dss=dss)
+      telout = tel[dss].outputs[tel[dss].name]
+    logger.debug("station_configuration: processing DSS-%d band %s",
+                 dss, band)
+    fename = f"{band}{dss}"
+    # one front end output for each polarization processed by the receiver
+    outnames = [f"{fename}{pol}" for _dss, _band, pol in channels]
+    fe[fename] = ClassInstance(FrontEnd,
+                               DSN_fe,
+                               fename,
+                               inputs = {fename: telout},
+                               output_names = outnames)
+    fe_outs = fe[fename].outputs
+    rx_inputs = {outname: fe_outs[outname] for outname in outnames}
+    rx_outnames = [f"{outname}U" for outname in outnames]
+    rx[fename] = ClassInstance(Receiver,
+                               DSN_rx,
+                               fename,
+                               inputs = rx_inputs,
+                               output_names = rx_outnames)
   equipment['Telescope'] = tel
   equipment['FrontEnd'] = fe
   equipment['Receiver'] = rx
   #This part has to be done by hand to show the physical cabling
-  if hardware['IF_switch']:
-    from Electronics.Instruments.JFW50MS import MS287client
-    IFswitch = ClassInstance(Device,
-                           MS287client,
-                           "Matrix Switch",
-                           inputs=make_switch_inputs(rx),
-                           output_names=['IF1', 'IF2', 'IF3', 'IF4'])
-    equipment['IF_switch'] = {"DTO": IFswitch}
-  else:
-    IFswitch = Device("JWF MS 287",
-                      inputs=make_switch_inputs(rx),
-                      output_names=['IF1', 'IF2', 'IF3', 'IF4'])
-    equipment['IF_switch'] = IFswitch
-  if hardware['sampling_clock']:
-    from Electronics.Instruments import Synthesizer
-    from Electronics.Instruments.Valon import Valon1, Valon2 
-    sample_clk = {}
-    sample_clk[0] = ClassInstance(Synthesizer,Valon1,timeout=10)
-    sample_clk[1] = ClassInstance(Synthesizer,Valon2,timeout=10)
-    logger.debug(" roach1 sample clock is %f",
-                 sample_clk[0].get_p("frequency"))
-    logger.debug(" roach2 sample clock is %f",
-                 sample_clk[1].get_p("frequency"))
-    equipment['sampling_clock'] = sample_clk
-  else:
-    equipment['sampling_clock'] = None
-    
+  # The IF switch client and the two synthesizers are independent devices
+  # (TCP and serial respectively), so their constructions are dispatched
+  # together; the wall time is then the slowest of the three instead of
+  # their sum.  The backend construction below has to wait for the switch
+  # because it is wired to the switch outputs.
+  with ThreadPoolExecutor(max_workers=3) as pool:
+    if hardware['IF_switch']:
+      from Electronics.Instruments.JFW50MS import MS287client
+      switch_future = pool.submit(ClassInstance,
+                                  Device,
+                                  MS287client,
+                                  "Matrix Switch",
+                                  inputs=make_switch_inputs(rx),
+                                  output_names=['IF1', 'IF2', 'IF3', 'IF4'])
+    else:
+      switch_future = None
+    if hardware['sampling_clock']:
+      from Electronics.Instruments import Synthesizer
+      from Electronics.Instruments.Valon import Valon1, Valon2
+      clk_futures = {num: pool.submit(ClassInstance, Synthesizer, cls,
+                                      timeout=10)
+                     for num, cls in enumerate((Valon1, Valon2))}
+    else:
+      clk_futures = None
+    if switch_future:
+      IFswitch = switch_future.result()
+      equipment['IF_switch'] = {"DTO": IFswitch}
+    else:
+      IFswitch = Device("JWF MS 287",
+                        inputs=make_switch_inputs(rx),
+                        output_names=['IF1', 'IF2', 'IF3', 'IF4'])
+      equipment['IF_switch'] = IFswitch
+    if clk_futures:
+      sample_clk = {num: future.result()
+                    for num, future in clk_futures.items()}
+      if logger.isEnabledFor(logging.DEBUG):
+        # each 'get_p' is a serial port transaction; don't pay for it unless
+        # the result will be logged
+        logger.debug(" roach1 sample clock is %f",
+                     sample_clk[0].get_p("frequency"))
+        logger.debug(" roach2 sample clock is %f",
+                     sample_clk[1].get_p("frequency"))
+      equipment['sampling_clock'] = sample_clk
+    else:
+      equipment['sampling_clock'] = None
+
+
   if hardware["Backend"]:
     from MonitorControl.BackEnds import Backend
     from MonitorControl.BackEnds.ROACH1 import KurtSpec_client
@@ -147,6 +158,7 @@ def station_configuration(equipment,
   return obs, equipment
 
 if __name__ == "__main__":
+  logging.basicConfig(level=logging.DEBUG)
 
   from MonitorControl.Configurations.GDSCC.DTO import station_configuration
   obs, tel, fe, rx, IFswitch, sample_clk, BE = station_configuration()
@@ -10,32 +10,27 @@ The output channels must have unique names because each has its own
 independent data stream.
 """
 import logging
-import Pyro
 
-from Electronics.Instruments import Synthesizer
-from Electronics.Instruments.JFW50MS import MS287client
-from Electronics.Instruments.Valon import Valon1, Valon2
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
 from MonitorControl import ClassInstance, Device, Observatory, Telescope
 from MonitorControl import ObservatoryError, Switch
 from MonitorControl.BackEnds import Backend
-#from MonitorControl.BackEnds.ROACH1 import SAOspec
-from MonitorControl.BackEnds.ROACH1.SAOfwif import SAObackend
-from MonitorControl.Configurations.GDSCC import cfg
+from MonitorControl.Configurations.GDSCC import CHANNELS, SWITCH_IN_NAMES, \
+                                                lan_status
 from MonitorControl.FrontEnds import FrontEnd
 from MonitorControl.FrontEnds.DSN import DSN_fe
 from MonitorControl.Receivers import Receiver
 from MonitorControl.Receivers.DSN import DSN_rx
-from support.network import LAN_hosts_status
 
 module_logger = logging.getLogger(__name__)
 
-up, down, IP, MAC, ROACHlist = LAN_hosts_status()
-n_roaches = len(ROACHlist)
-if n_roaches < 2:
-  module_logger.warning("Only %d ROACHes available", n_roaches)
-if n_roaches < 1:
-  raise ObservatoryError("", "Cannot proceed without ROACHes")
-roaches = ROACHlist[:2]
+# Physical cabling of the receiver outputs to the matrix switch inputs, in
+# switch input order starting at In01; inputs beyond the table are not
+# connected.
+_WIRING = (('S24','R'), ('S26','R'), ('X15','R'),  ('X25','R'), ('Ka25','R'),
+           ('S15','R'), ('X26','R'), ('Ka26','R'), ('S14','R'), ('X14','R'))
 
 def station_configuration(equipment, roach_loglevel=logging.WARNING, hardware=None):
   """
@@ -68,88 +63,97 @@ def station_configuration(equipment, roach_loglevel=logging.WARNING, hardware=No
       }
   if equipment is None:
       equipment = {}
+  # The hardware drivers are imported here so that merely importing this
+  # module does not pull in Pyro and the instrument stacks.
+  import Pyro
+  from Electronics.Instruments import Synthesizer
+  from Electronics.Instruments.JFW50MS import MS287client
+  from Electronics.Instruments.Valon import Valon1, Valon2
+  #from MonitorControl.BackEnds.ROACH1 import SAOspec
+  from MonitorControl.BackEnds.ROACH1.SAOfwif import SAObackend
+  up, down, IP, MAC, ROACHlist = lan_status()
+  n_roaches = len(ROACHlist)
+  if n_roaches < 2:
+    module_logger.warning("Only %d ROACHes available", n_roaches)
+  if n_roaches < 1:
+    raise ObservatoryError("", "Cannot proceed without ROACHes")
+  roaches = ROACHlist[:2]
   # Define the site
   obs = Observatory("GDSCC")
   tel = {}
   fe = {}
   rx = {}
-  # For each station at the site, get a Telescope object, FrontEnd objects,
-  # Receiver objects, Switch objects
-  for dss in cfg.keys():                                 # 14,...,26
-    module_logger.debug("station_configuration: processing DSS-%d", dss)
-    # define the telescope
-    tel[dss] = Telescope(obs, dss=dss, hardware=hardware["Antenna"])
-    # for each band available on the telescope
-    for band in cfg[dss].keys():                         # S, X, Ka
-      module_logger.debug("station_configuration: processing band %s", dss)
-      fename = band+str(dss)
-      outnames = []
-      # for each polarization processed by the receiver
-      for pol in cfg[dss][band].keys():                  # L, R
-        module_logger.debug("station_configuration: processing pol %s", pol)
-        outnames.append(fename+pol)   #   cfg[dss][band][pol])
-      module_logger.debug("station_configuration: FE output names: %s", outnames)
-      fe[fename] = ClassInstance(FrontEnd, 
-                                 DSN_fe, 
-                                 fename,
-                                 hardware=hardware["FrontEnd"],
-                                 inputs = {fename:
-                                           tel[dss].outputs[tel[dss].name]},
-                                 output_names = outnames)
-      rx_inputs = {}
-      rx_outnames = []
-      for outname in outnames:
-        rx_inputs[outname] = fe[fename].outputs[outname]
-        rx_outnames.append(outname+'U')                 # all DSN IFs are USB
-      rx[fename] = ClassInstance(Receiver, 
-                                 DSN_rx, 
-                                 fename,
-                                 hardware=hardware["Receiver"],
-                                 inputs = rx_inputs,
-                                 output_names = rx_outnames)
+  # gate the per-channel debug calls once instead of paying the handler
+  # walk for every one of them at INFO level
+  dbg = module_logger.isEnabledFor(logging.DEBUG)
+  # For each receiver channel at the site, grouped by station and band, get
+  # a Telescope object, FrontEnd objects, Receiver objects, Switch objects
+  for (dss, band), channels in groupby(CHANNELS, key=lambda chl: chl[:2]):
+    if dss not in tel:
+      if dbg:
+        module_logger.debug("station_configuration: processing DSS-%d", dss)
+      # define the telescope; its single output feeds every band
+      tel[dss] = Telescope(obs, dss=dss, hardware=hardware["Antenna"])
+      telout = tel[dss].outputs[tel[dss].name]
+    if dbg:
+      module_logger.debug("station_configuration: processing band %s", band)
+    fename = band+str(dss)
+    # one front end output for each polarization processed by the receiver
+    outnames = [fename+pol for _dss, _band, pol in channels]
+    if dbg:
+      module_logger.debug("station_configuration: FE output names: %s",
+                          outnames)
+    fe[fename] = ClassInstance(FrontEnd,
+                               DSN_fe,
+                               fename,
+                               hardware=hardware["FrontEnd"],
+                               inputs = {fename: telout},
+                               output_names = outnames)
+    fe_outs = fe[fename].outputs
+    rx_inputs = {outname: fe_outs[outname] for outname in outnames}
+    rx_outnames = [outname+'U' for outname in outnames] # all DSN IFs are USB
+    rx[fename] = ClassInstance(Receiver,
+                               DSN_rx,
+                               fename,
+                               hardware=hardware["Receiver"],
+                               inputs = rx_inputs,
+                               output_names = rx_outnames)
   equipment['Telescope'] = tel
   equipment['FrontEnd'] = fe
   equipment['Receiver'] = rx
-  #This part has to be done by hand to show the physical cabling
-  try:
-    IFswitch = ClassInstance(Device,
-                           MS287client,
-                           "Matrix Switch",
-                           inputs={'In01': rx['S24'].outputs['S24RU'],
-                                   'In02': rx['S26'].outputs['S26RU'],
-                                   'In03': rx['X15'].outputs['X15RU'],
-                                   'In04': rx['X25'].outputs['X25RU'],
-                                   'In05': rx['Ka25'].outputs['Ka25RU'],
-                                   'In06': rx['S15'].outputs['S15RU'],
-                                   'In07': rx['X26'].outputs['X26RU'],
-                                   'In08': rx['Ka26'].outputs['Ka26RU'],
-                                   'In09': rx['S14'].outputs['S14RU'],
-                                   'In10': rx['X14'].outputs['X14RU'],
-                                   'In11': None,
-                                   'In12': None,
-                                   'In13': None,
-                                   'In14': None,
-                                   'In15': None,
-                                   'In16': None,
-                                   'In17': None,
-                                   'In18': None,
-                                   'In19': None,
-                                   'In20': None,
-                                   'In21': None,
-                                   'In22': None,
-                                   'In23': None,
-                                   'In24': None},
-                           output_names=['IF1', 'IF2', 'IF3', 'IF4'])
-  except Pyro.errors.NamingError:
-    module_logger.error("Is the MS287 IF switch server running?")
+  #The wiring table shows the physical cabling
+  wiring = _WIRING + (None,)*(24 - len(_WIRING))
+  switch_inputs = {SWITCH_IN_NAMES[num+1]:
+                     (rx[pair[0]].outputs[pair[0]+pair[1]+'U'] if pair
+                      else None)
+                   for num, pair in enumerate(wiring)}
+  # The switch client and the two synthesizers each do a name-server lookup
+  # and connect; they are independent, so the three connections are made
+  # concurrently and the wall time is that of the slowest one.
+  with ThreadPoolExecutor(max_workers=3) as pool:
+    switch_future = pool.submit(ClassInstance,
+                                Device,
+                                MS287client,
+                                "Matrix Switch",
+                                inputs=switch_inputs,
+                                output_names=['IF1', 'IF2', 'IF3', 'IF4'])
+    clk_futures = {num: pool.submit(ClassInstance, Synthesizer, cls,
+                                    timeout=10)
+                   for num, cls in enumerate((Valon1, Valon2))}
+    try:
+      IFswitch = switch_future.result()
+    except Pyro.errors.NamingError:
+      module_logger.error("Is the MS287 IF switch server running?")
+    sample_clk = {num: future.result()
+                  for num, future in clk_futures.items()}
   equipment['IF_switch'] = {"DTO": IFswitch}
-  sample_clk = {}
-  sample_clk[0] = ClassInstance(Synthesizer,Valon1,timeout=10)
-  sample_clk[1] = ClassInstance(Synthesizer,Valon2,timeout=10)
-  module_logger.debug(" roach1 sample clock is %f",
-                 sample_clk[0].get_p("frequency"))
-  module_logger.debug(" roach2 sample clock is %f",
-                 sample_clk[1].get_p("frequency"))
+  if module_logger.isEnabledFor(logging.DEBUG):
+    # each 'get_p' is a serial port transaction; don't pay for it unless
+    # the result will be logged
+    module_logger.debug(" roach1 sample clock is %f",
+                        sample_clk[0].get_p("frequency"))
+    module_logger.debug(" roach2 sample clock is %f",
+                        sample_clk[1].get_p("frequency"))
   equipment['Synthesizer'] 
   BE = ClassInstance(Backend,
                      SAObackend,
@@ -169,14 +173,14 @@ if __name__ == "__main__":
   from MonitorControl.Configurations import station_configuration
 
   obs, equipment = station_configuration('DTO-32K')
-  print "obs =", obs
+  print("obs =", obs)
   tel = equipment['Telescope']
   fe = equipment['FrontEnd']
   rx = equipment['Receiver']
-  print "tel =", tel
-  print "fe =", fe
-  print "rx =", rx
+  print("tel =", tel)
+  print("fe =", fe)
+  print("rx =", rx)
   IFswitch = equipment['IF_switch']
-  print "IFswitch =", IFswitch
+  print("IFswitch =", IFswitch)
   BE = equipment['Backend']
-  print "BE =", BE
+  print("BE =", BE)
@@ -9,28 +9,43 @@ MonitorControl module.
 The output channels must have unique names because each has its own
 independent data stream.
 """
+import functools
 import logging
-import Pyro
 
-from Electronics.Instruments import Synthesizer
-from Electronics.Instruments.JFW50MS import MS287client
-from Electronics.Instruments.Valon import Valon1, Valon2
 from MonitorControl import ClassInstance, Device, Observatory
 from MonitorControl import ObservatoryError, Switch
 from MonitorControl.Antenna import Telescope
 from MonitorControl.BackEnds import Backend
-from MonitorControl.BackEnds.ROACH1 import SAOspec
-from MonitorControl.BackEnds.ROACH1.SAOfwif import SAObackend
 from MonitorControl.Configurations.GDSCC import cfg, make_switch_inputs
 from MonitorControl.FrontEnds import FrontEnd
-from MonitorControl.FrontEnds.DSN import DSN_fe
 from MonitorControl.Receivers import Receiver
-from MonitorControl.Receivers.DSN import DSN_rx
-from support.network import LAN_hosts_status
 
 logger = logging.getLogger(__name__)
 
 
+class LazyInit(object):
+  """
+  Proxy which defers construction of a device until it is first used
+
+  The factory is called on the first attribute access and the instance is
+  kept for all later accesses, so a device which is never used never opens
+  its connection (for the Valons that saves a Pyro round trip with a 10 s
+  worst-case timeout).
+  """
+  def __init__(self, factory):
+    """
+    @param factory : called without arguments to create the device
+    @type  factory : callable
+    """
+    self._factory = factory
+    self._instance = None
+
+  def __getattr__(self, name):
+    if self._instance is None:
+      self._instance = self._factory()
+    return getattr(self._instance, name)
+
+
 def station_configuration(equipment,
                           roach_loglevel=logging.WARNING,
                           hardware=None):
@@ -67,44 +82,60 @@ def station_configuration(equipment,
       }
   if equipment is None:
       equipment = {}
-    
+  # The hardware drivers are imported here so that merely importing this
+  # module does not pull in Pyro and the instrument stacks.
+  import Pyro
+  from Electronics.Instruments import Synthesizer
+  from Electronics.Instruments.JFW50MS import MS287client
+  from Electronics.Instruments.Valon import Valon1, Valon2
+  from MonitorControl.BackEnds.ROACH1 import SAOspec
+  from MonitorControl.FrontEnds.DSN import DSN_fe
+  from MonitorControl.Receivers.DSN import DSN_rx
+
   # Define the site
   obs = Observatory("GDSCC")
+  # bind the base class and implementation once; the loop below then calls
+  # the specialized factories instead of re-resolving them for every band
+  _mk_fe = functools.partial(ClassInstance, FrontEnd, DSN_fe)
+  _mk_rx = functools.partial(ClassInstance, Receiver, DSN_rx)
   tel = {}
   fe = {}
   rx = {}
+  # gate the per-channel debug calls once instead of paying the handler
+  # walk for every one of them at INFO level
+  dbg = logger.isEnabledFor(logging.DEBUG)
   # For each station at the site, get a Telescope object, FrontEnd objects,
   # Receiver objects, Switch objects
   for dss in cfg.keys():                                 # 14,...,26
-    logger.debug("station_configuration: processing DSS-%d", dss)
+    if dbg:
+      logger.debug("station_configuration: processing DSS-%d", dss)
     # define the telescope
     tel[dss] = Telescope(obs, dss=dss, active=hardware["Antenna"])
     # for each band available on the telescope
     for band in cfg[dss].keys():                         # S, X, Ka
-      logger.debug("station_configuration: processing band %s", dss)
+      if dbg:
+        logger.debug("station_configuration: processing band %s", dss)
       fename = band+str(dss)
       outnames = []
       # for each polarization processed by the receiver
       for pol in cfg[dss][band].keys():                  # L, R
-        logger.debug("station_configuration: processing pol %s", pol)
+        if dbg:
+          logger.debug("station_configuration: processing pol %s", pol)
         outnames.append(fename+pol)   #   cfg[dss][band][pol])
-      logger.debug("station_configuration: FE output names: %s", outnames)
-      fe[fename] = ClassInstance(FrontEnd, 
-                                 DSN_fe, 
-                                 fename,
-                                 inputs = {fename:
-                                           tel[dss].outputs[tel[dss].name]},
-                                 output_names = outnames)
+      if dbg:
+        logger.debug("station_configuration: FE output names: %s", outnames)
+      fe[fename] = _mk_fe(fename,
+                          inputs = {fename:
+                                    tel[dss].outputs[tel[dss].name]},
+                          output_names = outnames)
       rx_inputs = {}
       rx_outnames = []
       for outname in outnames:
         rx_inputs[outname] = fe[fename].outputs[outname]
         rx_outnames.append(outname+'U')                 # all DSN IFs are USB
-      rx[fename] = ClassInstance(Receiver, 
-                                 DSN_rx, 
-                                 fename,
-                                 inputs = rx_inputs,
-                                 output_names = rx_outnames)
+      rx[fename] = _mk_rx(fename,
+                          inputs = rx_inputs,
+                          output_names = rx_outnames)
   equipment['Telescope'] = tel
   equipment['FrontEnd'] = fe
   equipment['Receiver'] = rx
@@ -117,15 +148,20 @@ def station_configuration(equipment,
                            inputs=make_switch_inputs(rx),
                            output_names=['IF1', 'IF2', 'IF3', 'IF4'])
     equipment['IF_switch'] = {"DTO": IFswitch}
-  except Pyro.errors.NamingError, details:
+  except Pyro.errors.NamingError as details:
     logger.error("Is the MS287 IF switch server running?")
     raise Pyro.errors.NamingError("Is the MS287 IF switch server running?")
   sample_clk = {}
-  sample_clk[0] = ClassInstance(Synthesizer,Valon1,timeout=10)
-  sample_clk[1] = ClassInstance(Synthesizer,Valon2,timeout=10)
-  logger.debug(" roach1 sample clock is %f",
+  sample_clk[0] = LazyInit(lambda: ClassInstance(Synthesizer,Valon1,
+                                                 timeout=10))
+  sample_clk[1] = LazyInit(lambda: ClassInstance(Synthesizer,Valon2,
+                                                 timeout=10))
+  if logger.isEnabledFor(logging.DEBUG):
+    # each 'get_p' is a serial port transaction; don't pay for it unless
+    # the result will be logged
+    logger.debug(" roach1 sample clock is %f",
                  sample_clk[0].get_p("frequency"))
-  logger.debug(" roach2 sample clock is %f",
+    logger.debug(" roach2 sample clock is %f",
                  sample_clk[1].get_p("frequency"))
   equipment['Synthesizer'] = sample_clk
   BE = ClassInstance(Backend,
@@ -146,14 +182,14 @@ if __name__ == "__main__":
   from MonitorControl.Configurations import station_configuration
 
   obs, equipment = station_configuration('DTO-32K')
-  print "obs =", obs
+  print("obs =", obs)
   tel = equipment['Telescope']
   fe = equipment['FrontEnd']
   rx = equipment['Receiver']
-  print "tel =", tel
-  print "fe =", fe
-  print "rx =", rx
+  print("tel =", tel)
+  print("fe =", fe)
+  print("rx =", rx)
   IFswitch = equipment['IF_switch']
-  print "IFswitch =", IFswitch
+  print("IFswitch =", IFswitch)
   BE = equipment['Backend']
-  print "BE =", BE
+  print("BE =", BE)
@@ -8,6 +8,7 @@ try:
 except:
   pass
 
+import functools
 import logging
 
 from Data_Reduction.DSN.WVSR.collector import WVSRmetadataCollector
@@ -18,9 +19,22 @@ from MonitorControl.BackEnds.DSN import WVSRbackend
 from MonitorControl.Configurations.DSN_standard import standard_equipment
 from support.logs import init_logging, get_loglevel
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+STOKES = ('I', 'Q', 'U', 'V')
+
+@functools.lru_cache(maxsize=32)
+def _get_collector(project, dss, year, doy, time=None):
+  """
+  Returns the metadata collector for an observing session
+
+  Constructing a WVSRmetadataCollector reads the session metadata from
+  disk and the network, so the collectors are cached on their arguments
+  and reconfiguring for the same session is free.  Use
+  '_get_collector.cache_clear()' to force fresh metadata.
+  """
+  return WVSRmetadataCollector(project, dss, year, doy, time)
+
 def station_configuration(equipment, project, dss, year, doy, time,
                           band, collector=None, roach_loglevel=None):
   """
@@ -35,26 +49,29 @@ def station_configuration(equipment, project, dss, year, doy, time,
   if collector:
     pass
   else:
-    collector = WVSRmetadataCollector(project, dss, year, doy, time)
+    collector = _get_collector(project, dss, year, doy, time)
   if equipment:
     pass
   else:
     equipment = standard_equipment(dss, band)
-  for wvsr in collector.wvsr_cfg.keys():
-    BE_inputs = {}
-    output_names = []
-    for IF in collector.wvsr_cfg[wvsr]['channels']:
-      band = collector.wvsr_cfg[wvsr][IF]['IF_source'].split('_')[1]
-      rx_name = band+str(dss)
-      rx = equipment['Receiver'][rx_name]
-      # the following depends on a naming convention which uses names like
-      # 'wvsr.IF1' and 'X14.chan_id 1.I' using '.' as separatots
-      BE_inputs[wvsr+".IF"+str(IF)] = rx.outputs[rx_name + \
-                                 collector.wvsr_cfg[wvsr][IF]['pol'][0] + 'U']
-    for subch in collector.wvsr_cfg[wvsr][1]['subchannels']:
-        for Stokes in ['I', 'Q', 'U', 'V']:
-          # use '_' to separate the name parts
-          output_names.append(rx_name + "."+subch+"."+Stokes)
+  receivers = equipment['Receiver']
+  for wvsr, cfgw in collector.wvsr_cfg.items():
+    # the receiver name for each IF comes from the IF source, e.g. 'X14'
+    # from '14_X_...'; only the second token is needed so the split is
+    # bounded
+    if_rx_names = [(IF, cfgw[IF]['IF_source'].split('_', 2)[1]+str(dss))
+                   for IF in cfgw['channels']]
+    # the following depends on a naming convention which uses names like
+    # 'wvsr.IF1' and 'X14.chan_id 1.I' using '.' as separatots
+    BE_inputs = {wvsr+".IF"+str(IF):
+                   receivers[rx_name].outputs[rx_name +
+                                              cfgw[IF]['pol'][0] + 'U']
+                 for IF, rx_name in if_rx_names}
+    # the output names use the receiver of the last IF
+    rx_name = if_rx_names[-1][1]
+    output_names = [f"{rx_name}.{subch}.{Stokes}"
+                    for subch in cfgw[1]['subchannels']
+                    for Stokes in STOKES]
     logger.debug("station_configuration: BE inputs: %s", BE_inputs)
     logger.debug("station_configuration: BE outputs: %s", output_names)
   
@@ -68,8 +85,10 @@ def station_configuration(equipment, project, dss, year, doy, time,
   return equipment
   
 if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+
   from MonitorControl.config_test import show_signal_path
-  
+
   mylogger = logging.getLogger()
   logger.setLevel(logging.DEBUG)
   mylogger = init_logging(mylogger,
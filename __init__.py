@@ -27,73 +27,232 @@ The following are from cable tracing and table from Larry (DVP-DTO.jpg)::
          -> J12A -> 24
     
 """
+import fcntl
+import json
 import logging
+import os
+import sys
+import time
+
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
-#     0 means not connected
-cfg = {14: {'S' :{'R':14,     # J9A    14S1
-                  'L': 4},    # J2A    14S2
-            'X' :{'R': 6,     # J10A   14X
-                  'L': 0}},   #     
-       15: {'S' :{'R': 0},    #      
-            'X' :{'R': 0}},   # J3A NC 15X1
-       24: {'S' :{'R': 2},    # J1A    24S1
-            'X' :{'R': 0,     # J12A   24X1
-                  'L': 0},    #
-            'Ka':{'R': 0}},   #      
-       25: {'X' :{'R': 8},    # J4A    25X1
-            'Ka':{'R':10}},   # J5A    25K1
-       26: {'S' :{'R': 0},    # 
-            'X' :{'R':18,     # J7A    26X
-                  'L': 0},    #
-            'Ka':{'R':20}}}   # J8A    26K
-
-feeds = {}
-
-mech = {14:{'diam': 70,
-            'type': 'cas'},
-        15:{'diam': 34,
-            'type': 'HEF'},
-        13:{'diam': 34,
-            'type': 'BWG'},
-        24:{'diam': 34,
-            'type': 'BWG'},
-        25:{'diam': 34,
-            'type': 'BWG'},
-        26:{'diam': 34,
-            'type': 'BWG'}}
-# We need 34 meter info. 
-wrap = {14: {'stow_az': 180,
-             'wrap':    {'center':  45,'dir':'CW'}},
-        15: {'stow_az': 0,
-             'wrap':    {'center': 135,'dir':'CW'}},
-        24: {'stow_az': 0,
-             'wrap':    {'center': 135,'dir':'CW'}},
-        25: {'stow_az': 0,
-             'wrap':    {'center': 135,'dir':'CW'}},
-        26: {'stow_az': 0,
-             'wrap':    {'center': 135,'dir':'CW'}}}
+# The configuration tables below are built on first access (PEP 562 module
+# '__getattr__') so that importers which only want, say, 'lan_status' or a
+# submodule do not pay for dicts they never read.
+
+def _freeze(mapping):
+  """
+  Returns a read-only view of 'mapping' with any nested dicts also frozen
+
+  The configuration tables describe cabling and hardware; they are never
+  changed at run time, so readers can alias them instead of defensively
+  copying.
+  """
+  return MappingProxyType({key: _freeze(value) if isinstance(value, dict)
+                                else value
+                           for key, value in mapping.items()})
+
+def _build_cfg():
+  #     0 means not connected
+  return _freeze(
+         {14: {'S' :{'R':14,     # J9A    14S1
+                     'L': 4},    # J2A    14S2
+               'X' :{'R': 6,     # J10A   14X
+                     'L': 0}},   #
+          15: {'S' :{'R': 0},    #
+               'X' :{'R': 0}},   # J3A NC 15X1
+          24: {'S' :{'R': 2},    # J1A    24S1
+               'X' :{'R': 0,     # J12A   24X1
+                     'L': 0},    #
+               'Ka':{'R': 0}},   #
+          25: {'X' :{'R': 8},    # J4A    25X1
+               'Ka':{'R':10}},   # J5A    25K1
+          26: {'S' :{'R': 0},    #
+               'X' :{'R':18,     # J7A    26X
+                     'L': 0},    #
+               'Ka':{'R':20}}})  # J8A    26K
+
+def _build_feeds():
+  return _freeze({})
+
+def _build_mech():
+  return _freeze(
+         {14:{'diam': 70,
+              'type': 'cas'},
+          15:{'diam': 34,
+              'type': 'HEF'},
+          13:{'diam': 34,
+              'type': 'BWG'},
+          24:{'diam': 34,
+              'type': 'BWG'},
+          25:{'diam': 34,
+              'type': 'BWG'},
+          26:{'diam': 34,
+              'type': 'BWG'}})
+
+def _build_wrap():
+  # We need 34 meter info.
+  return _freeze(
+         {14: {'stow_az': 180,
+               'wrap':    {'center':  45,'dir':'CW'}},
+          15: {'stow_az': 0,
+               'wrap':    {'center': 135,'dir':'CW'}},
+          24: {'stow_az': 0,
+               'wrap':    {'center': 135,'dir':'CW'}},
+          25: {'stow_az': 0,
+               'wrap':    {'center': 135,'dir':'CW'}},
+          26: {'stow_az': 0,
+               'wrap':    {'center': 135,'dir':'CW'}}})
+
+# Flattened views of 'cfg' computed once on first access so that the
+# configuration builders can iterate the stations linearly instead of
+# re-walking the nested dicts.
+
+def _build_channels():
+  return tuple((dss, band, pol) for dss, bands in _this.cfg.items()
+                                for band, pols in bands.items()
+                                for pol in pols)
+
+def _build_bands():
+  return tuple((dss, band) for dss, bands in _this.cfg.items()
+                           for band in bands)
+
+def _build_cfg_flat():
+  # 0 means "not connected", so those channels are left out here rather
+  # than filtered by every consumer
+  return tuple((dss, band, pol, swin) for dss, bands in _this.cfg.items()
+                                      for band, pols in bands.items()
+                                      for pol, swin in pols.items()
+                                      if swin)
+
+def _build_swin_to_signal():
+  # reverse index: switch input number -> the signal wired to it
+  return {swin: (dss, band, pol)
+          for dss, band, pol, swin in _this.CFG_FLAT}
+
+_builders = {'cfg':            _build_cfg,
+             'feeds':          _build_feeds,
+             'mech':           _build_mech,
+             'wrap':           _build_wrap,
+             'CHANNELS':       _build_channels,
+             'BANDS':          _build_bands,
+             'CFG_FLAT':       _build_cfg_flat,
+             'SWIN_TO_SIGNAL': _build_swin_to_signal}
+
+# attribute access through the module object goes through '__getattr__';
+# functions in this module use '_this.name' for the lazy tables
+_this = sys.modules[__name__]
+
+def __getattr__(name):
+  """
+  Builds a configuration table the first time it is asked for
+  """
+  try:
+    builder = _builders[name]
+  except KeyError:
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+  value = builder()
+  globals()[name] = value
+  return value
+
+# switch input names indexed by input number; index 0 is the "not
+# connected" sentinel
+SWITCH_IN_NAMES = tuple("In%02d" % index for index in range(25))
 
 def make_switch_inputs(rx):
   """
   Identifies the signals going into the IF switch
   """
-  inputs = {}
-  for index in range(1,25):
-    inputs["In%02d" % index] = None
-  for dss in list(cfg.keys()):
-    logger.debug("make_switch_inputs: doing DSS %d", dss)
-    for band in list(cfg[dss].keys()):
-      logger.debug("make_switch_inputs: doing band %s", band)
-      logger.debug("make_switch_inputs: details: %s", cfg[dss][band])
-      for pol in list(cfg[dss][band].keys()):
-        swin = "In%02d" % cfg[dss][band][pol]
-        rxout = band+str(dss)+pol+"U"
-        inputs[swin] = rx[band+str(dss)].outputs[rxout]
-        logger.debug("DSS-%2d %s %s goes to %s from %s",
-                     dss, band, pol, swin, rxout)
-  inputs.pop("In00") # all the receivers not connected to switch inputs
-  print(("make_switch_inputs: %s" % inputs))
+  dbg = logger.isEnabledFor(logging.DEBUG)
+  inputs = {name: None for name in SWITCH_IN_NAMES[1:]}
+  for swin_idx, (dss, band, pol) in _this.SWIN_TO_SIGNAL.items():
+    fename = band+str(dss)
+    swin = SWITCH_IN_NAMES[swin_idx]
+    rxout = fename+pol+"U"
+    inputs[swin] = rx[fename].outputs[rxout]
+    if dbg:
+      logger.debug("DSS-%2d %s %s goes to %s from %s",
+                   dss, band, pol, swin, rxout)
+  if dbg:
+    # this formats the reprs of two dozen Device ports; keep it behind the
+    # debug gate
+    logger.debug("make_switch_inputs: %s", inputs)
   return inputs
 
+_lan_status = None
+_lan_cache_file = os.path.join(os.path.expanduser("~"), ".cache",
+                               "gdscc_lan.json")
+
+def lan_status(ttl=300):
+  """
+  Reports the status of the hosts on the GDSCC LAN
+
+  The sweep of the subnet is the dominant cost of importing the DTO
+  configurations, so the result of the first call is kept and returned for
+  all later calls in the same session.  Between sessions the result is kept
+  in a cache file and re-used as long as it is less than 'ttl' seconds old,
+  so only the first import after the TTL expires pays for a sweep.  The
+  sweep itself is done by 'LAN_hosts_status' in the support package.
+
+  @param ttl : maximum age in seconds of a usable cached result
+  @type  ttl : int
+  """
+  global _lan_status
+  if _lan_status is None:
+    _lan_status = _read_lan_cache(ttl)
+  if _lan_status is None:
+    from support.network import LAN_hosts_status
+    _lan_status = LAN_hosts_status()
+    _write_lan_cache(_lan_status)
+  return _lan_status
+
+def invalidate_lan_cache():
+  """
+  Forces the next 'lan_status' call to sweep the LAN again
+  """
+  global _lan_status
+  _lan_status = None
+  try:
+    os.unlink(_lan_cache_file)
+  except OSError:
+    pass
+
+def _read_lan_cache(ttl):
+  """
+  Returns the cached LAN status if it is less than 'ttl' seconds old
+  """
+  try:
+    with open(_lan_cache_file) as cache:
+      # servers and scripts share the cache file, so take the lock while
+      # reading in case another process is mid-update
+      fcntl.flock(cache, fcntl.LOCK_SH)
+      try:
+        data = json.load(cache)
+      finally:
+        fcntl.flock(cache, fcntl.LOCK_UN)
+    if time.time() - data['ts'] <= ttl:
+      return (data['up'], data['down'], data['IP'], data['MAC'],
+              data['ROACHlist'])
+  except (OSError, KeyError, ValueError):
+    pass
+  return None
+
+def _write_lan_cache(status):
+  """
+  Saves the LAN status with a timestamp for later sessions
+  """
+  up, down, IP, MAC, ROACHlist = status
+  try:
+    os.makedirs(os.path.dirname(_lan_cache_file), exist_ok=True)
+    with open(_lan_cache_file, 'w') as cache:
+      fcntl.flock(cache, fcntl.LOCK_EX)
+      try:
+        json.dump({'up': up, 'down': down, 'IP': IP, 'MAC': MAC,
+                   'ROACHlist': ROACHlist, 'ts': time.time()}, cache)
+      finally:
+        fcntl.flock(cache, fcntl.LOCK_UN)
+  except OSError:
+    logger.warning("lan_status: could not write %s", _lan_cache_file)
+
@@ -8,6 +8,12 @@ The only devices we can control are the DTO IF switch and the ROACHes.
 """
 import logging
 import sys
+import threading
+import time
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
 
 from MonitorControl.Configurations import station_configuration
 from support.logs import get_loglevel, initiate_option_parser, init_logging
@@ -16,6 +22,15 @@ from support.pyro import PyroServerLauncher, PyroServer
 
 logger = logging.getLogger(__name__)
 
+# dispatch schedule for one switch group with the kurtosis firmware: the
+# switch output index, the ROACH handling it and its RF channel name.
+# Computed once so the sweeps do no per-iteration arithmetic or string
+# building.
+_KURT_DISPATCH = tuple((SWout,
+                        "roach"+str(1 + SWout % 2),
+                        "Ro%dIn%d" % (1 + SWout % 2, 1 + SWout // 2))
+                       for SWout in range(4))
+
 class DTO_Manager(PyroServer):
   """
   Class for operation of the kurtosis spectrometer server and other servers
@@ -61,34 +76,101 @@ class DTO_Manager(PyroServer):
     self.sample_clk = equip['sampling_clock']
     self.logger.debug("__init__: getting status")
     self.sw_states = self.switch.get_states()
-    self.DSPnames = self.spectrometer.roach.keys()
+    self.DSPnames = tuple(self.spectrometer.roach.keys())
+    # the surveys are latency-bound on the per-channel remote calls, so
+    # they fan the calls out over this pool and wait for the slowest one
+    self._pool = ThreadPoolExecutor(max_workers=4*len(self.DSPnames))
+    # ADC input levels read within 'adc_ttl' seconds of the last read are
+    # served from this cache; steering the switch invalidates it
+    self._adc_cache = {}   # (name, RF) -> (monotonic time, value)
+    self.adc_ttl = 0.2
     self.RFchannel = {}
-    self.gain = {}
-    self.enabled = {}
     self.firmware = {}
+    # collect the initial state with one burst of concurrent calls per
+    # device instead of a serial round trip for every value
+    fw_futures = {}
+    state_futures = {}
     for name in self.DSPnames:
-      RFids = self.spectrometer.roach[name].RFchannel.keys()
-      self.RFchannel[name] = {} 
-      self.gain[name] = {}
-      self.enabled[name] = {}
-      self.firmware[name] = self.spectrometer.roach[name].firmware()
-      for RF in RFids:
-        self.RFchannel[name][RF] = self.spectrometer.roach[name].RFchannel[RF]
-        self.gain[name][RF] = self.RFchannel[name][RF].RF_gain_get()
-        self.enabled[name][RF] = self.RFchannel[name][RF].RF_enabled()
+      roach = self.spectrometer.roach[name]
+      self.RFchannel[name] = {}
+      fw_futures[name] = self._pool.submit(roach.firmware)
+      for RF in roach.RFchannel.keys():
+        channel = roach.RFchannel[RF]
+        self.RFchannel[name][RF] = channel
+        state_futures[(name, RF)] = (self._pool.submit(channel.RF_gain_get),
+                                     self._pool.submit(channel.RF_enabled))
+    for name, future in fw_futures.items():
+      self.firmware[name] = future.result()
+    # which ROACHes can report temperatures is fixed at start-up; a None
+    # entry or missing firmware disqualifies the device once, here,
+    # instead of being re-tested on every check
+    self._temp_capable = tuple(
+                    name for name in self.DSPnames
+                    if self.spectrometer.roach.get(name) is not None
+                       and self.firmware.get(name))
+    for name in self.DSPnames:
+      if name not in self._temp_capable:
+        self.logger.warning("__init__: no ADC temperatures from roach %s",
+                            name)
+    # flat channel list so the survey methods iterate once instead of
+    # nesting over names and keys views; the gain and enabled states live
+    # in flat arrays indexed the same way, written in place on update
+    self._all_rf = tuple((name, RF) for name in self.DSPnames
+                                    for RF in self.RFchannel[name])
+    self._chan_index = {chan: index
+                        for index, chan in enumerate(self._all_rf)}
+    self._gain_arr = np.zeros(len(self._all_rf), dtype=np.float32)
+    self._enabled_arr = np.zeros(len(self._all_rf), dtype=bool)
+    for chan, (gain_future, enabled_future) in state_futures.items():
+      index = self._chan_index[chan]
+      self._gain_arr[index] = gain_future.result()
+      self._enabled_arr[index] = enabled_future.result()
+    # force the initial connection on every proxy now, in parallel, so
+    # the first survey does not pay the connection handshakes
+    binds = [self._pool.submit(proxy._pyroBind)
+             for proxy in ([self.switch] +
+                           [self.RFchannel[name][RF]
+                            for name, RF in self._all_rf])
+             if hasattr(proxy, '_pyroBind')]
+    for future in binds:
+      future.result()
+    # temperatures change on a seconds timescale, much slower than
+    # operators poll during a survey, so a background thread keeps the
+    # cache fresh and check_ADC_temps returns without blocking
+    self.temp_refresh_s = 5.0
+    self._ADC_temps_cache = {}
+    threading.Thread(target=self._temp_refresher, daemon=True).start()
     self.logger.debug("__init__: done")
-    
+
+  @property
+  def gain(self):
+    """
+    Gains of the RF sections as a nested dict view of the gain array
+    """
+    gains = {name: {} for name in self.DSPnames}
+    for (name, RF), index in self._chan_index.items():
+      gains[name][RF] = float(self._gain_arr[index])
+    return gains
+
+  @property
+  def enabled(self):
+    """
+    Enabled states of the RF sections as a nested dict view
+    """
+    enabled = {name: {} for name in self.DSPnames}
+    for (name, RF), index in self._chan_index.items():
+      enabled[name][RF] = bool(self._enabled_arr[index])
+    return enabled
+
   def adjust_ADC_inputs(self):
     """
     Adjusts the RF section gains to be optimized
     
     NOT FINISHED
     """
-    self.ADC_input = {}
-    for name in self.DSPnames:
-      self.ADC_input[name] = {}
-      for RF in self.RFchannel[name].keys():
-        self.ADC_input[name][RF] = self.RFchannel[name][RF].get_ADC_input()
+    self.ADC_input = {name: {} for name in self.DSPnames}
+    for name, RF in self._all_rf:
+      self.ADC_input[name][RF] = self.RFchannel[name][RF].get_ADC_input()
     return self.ADC_input
         
   def check_ADC_inputs(self):
@@ -118,13 +200,34 @@ class DTO_Manager(PyroServer):
                                      'sample mean': -0.47607421875,
                                      'sample std': 14.866665332342238}}}
     """
-    self.ADC_input = {}
-    for name in self.DSPnames:
-      self.ADC_input[name] = {}
-      self.logger.debug("check_ADC_inputs: for %s", self.RFchannel[name])
-      for RF in self.RFchannel[name].keys():
-        self.logger.debug("check_ADC_inputs: called for %s channel %s", name, RF)
-        self.ADC_input[name][RF] = self.RFchannel[name][RF].get_ADC_input()
+    if hasattr(self.spectrometer, 'get_all_ADC_inputs'):
+      # backends with this method return every channel in one round trip
+      self.ADC_input = self.spectrometer.get_all_ADC_inputs()
+      now = time.monotonic()
+      for name, RF in self._all_rf:
+        self._adc_cache[(name, RF)] = (now, self.ADC_input[name][RF])
+      return self.ADC_input
+    # one blocking remote call per RF channel; issue them all at once so
+    # the survey takes one round trip instead of four.  Levels read less
+    # than 'adc_ttl' seconds ago are served from the cache.
+    now = time.monotonic()
+    self.ADC_input = {name: {} for name in self.DSPnames}
+    futures = {}
+    for name, RF in self._all_rf:
+      cached = self._adc_cache.get((name, RF))
+      if cached and now - cached[0] <= self.adc_ttl:
+        self.ADC_input[name][RF] = cached[1]
+      else:
+        futures[(name, RF)] = self._pool.submit(
+                                        self.RFchannel[name][RF].get_ADC_input)
+    dbg = self.logger.isEnabledFor(logging.DEBUG)
+    for (name, RF), future in futures.items():
+      if dbg:
+        self.logger.debug("check_ADC_inputs: called for %s channel %s",
+                          name, RF)
+      value = future.result()
+      self._adc_cache[(name, RF)] = (now, value)
+      self.ADC_input[name][RF] = value
     return self.ADC_input
             
   def check_ADC_temps(self):
@@ -137,26 +240,41 @@ class DTO_Manager(PyroServer):
                'roach2': {0: {'IC': 107.1875, 'ambient': 40.9375}}}
 
     """
-    self.ADC_temps = {}
-    for name in self.DSPnames:
-      # m.roaches keys are integers
-      if self.spectrometer.roach[name]:
-        # 'None' is allowed but ignored
-        if self.spectrometer.roach[name].firmware:
-          try:
-            self.logger.info("check_ADC_temps: for %s", name)
-            self.ADC_temps[name] = self.spectrometer.roach[name].get_temperatures()
-          except RuntimeError:
-            self.logger.error(" Could not get "+name+" temperatures", exc_info=True)
-            self.ADC_temps[name] = None
-        else:
-          self.logger.warning(
-                       " Cannot get roach %s temps because it has no firmware",name)
-          self.ADC_temps[name] = None
-      else:
-        self.logger.warning(" 'None' was ignored for roach %s", ID)
-        self.ADC_temps[name] = None
+    if not self._ADC_temps_cache:
+      # first query before the refresher has completed a pass
+      self._ADC_temps_cache = self._read_ADC_temps()
+    self.ADC_temps = self._ADC_temps_cache
     return self.ADC_temps
+
+  def _read_ADC_temps(self):
+    """
+    Reads the ADC temperatures from every capable ROACH in parallel
+    """
+    # devices which cannot report temperatures were identified once in
+    # __init__; only the capable ones are queried
+    temps = {name: None for name in self.DSPnames}
+    futures = {}
+    for name in self._temp_capable:
+      self.logger.info("check_ADC_temps: for %s", name)
+      futures[name] = self._pool.submit(
+                                  self.spectrometer.roach[name].get_temperatures)
+    for name in futures.keys():
+      try:
+        temps[name] = futures[name].result()
+      except RuntimeError:
+        self.logger.error(" Could not get "+name+" temperatures", exc_info=True)
+    return temps
+
+  def _temp_refresher(self):
+    """
+    Keeps the temperature cache fresh from a background thread
+    """
+    while True:
+      try:
+        self._ADC_temps_cache = self._read_ADC_temps()
+      except Exception:
+        self.logger.error("_temp_refresher: update failed", exc_info=True)
+      time.sleep(self.temp_refresh_s)
   
   def check_firmware(self):
     """
@@ -174,10 +292,9 @@ class DTO_Manager(PyroServer):
   def check_ROACH_fans(self):
     """
     """
-    fan_state = {}
-    for name in self.DSPnames:
-      fan_state[name] = self.spectrometer.roach[name].check_fans()
-    return fan_state
+    futures = {name: self._pool.submit(self.spectrometer.roach[name].check_fans)
+               for name in self.DSPnames}
+    return {name: future.result() for name, future in futures.items()}
 
   def get_active_channels(self):
     """
@@ -193,15 +310,46 @@ class DTO_Manager(PyroServer):
     """
      Get states of sampler clocks
     """
-    for clk in self.sample_clk.keys():
-      self.sample_clk[clk].update_synth_status()
-      self.sample_clk[clk].status = self.sample_clk[clk].hw.status[clk+1]
-      self.sample_clk[clk].freq   = self.sample_clk[clk].status["frequency"]
-      self.sample_clk[clk].pwr    = self.sample_clk[clk].status["rf_level"]
-      self.logger.info(
+    def refresh(clk):
+      clock = self.sample_clk[clk]
+      clock.update_synth_status()
+      clock.status = clock.hw.status[clk+1]
+      clock.freq   = clock.status["frequency"]
+      clock.pwr    = clock.status["rf_level"]
+      return clock
+    # the clocks are refreshed concurrently; each refresh is a chain of
+    # remote reads against one synthesizer
+    futures = {clk: self._pool.submit(refresh, clk)
+               for clk in self.sample_clk.keys()}
+    clocks = {clk: future.result() for clk, future in futures.items()}
+    if self.logger.isEnabledFor(logging.INFO):
+      # formatting the status dict calls repr on every value
+      for clk in clocks.keys():
+        self.logger.info(
                  "get_sampler_clocks_status:\nsampler clock %d status is %s",
-                 clk, self.sample_clk[clk].status)
-      return self.sample_clk[clk]          
+                 clk, clocks[clk].status)
+    return clocks
+
+  def _read_ADC_stat(self, dtype):
+    """
+    Reads one statistic of the ADC input level from every RF channel
+
+    Servers with a 'get_ADC_stat' method do the field selection remotely
+    so only a scalar per channel crosses the network; older servers fall
+    back to shipping the whole statistics dict.
+    """
+    futures = {}
+    for name, RF in self._all_rf:
+      channel = self.RFchannel[name][RF]
+      if hasattr(channel, 'get_ADC_stat'):
+        futures[(name, RF)] = self._pool.submit(channel.get_ADC_stat, dtype)
+      else:
+        futures[(name, RF)] = self._pool.submit(
+                                 lambda chl=channel: chl.get_ADC_input()[dtype])
+    stats = {name: {} for name in self.DSPnames}
+    for (name, RF), future in futures.items():
+      stats[name][RF] = future.result()
+    return stats
 
   def survey_ADC_inputs(self, dtype='sample std'):
     """
@@ -219,28 +367,47 @@ class DTO_Manager(PyroServer):
                20: 19.866611599872531,  21: 100.37293565384729,
                22: 14.672623631996771,  23:  15.126908283893673}
     """
+    if hasattr(self.spectrometer, 'run_survey'):
+      # backends which can drive the sweep themselves do the whole
+      # 24-input scan locally and return it in one round trip
+      return self.spectrometer.run_survey(dtype)
     ADCin = {}
     if self.firmware['roach1'] != self.firmware['roach2']:
       self.logger.error(
                     "survey_ADC_inputs: roaches do not have the same firmware")
     elif self.firmware['roach1'] == 'sao_spec':
       for SWin in range(0,24,2):
-        for SWout in range(2):
-          self.switch.set_state(str(SWout+1), SWin+SWout+1)
-        ADC_levels = self.check_ADC_inputs()
-        ADCin[SWin]   = ADC_levels['roach1']['IF1pwr'][dtype]
-        ADCin[SWin+1] = ADC_levels['roach2']['IF2pwr'][dtype]
+        # the outputs are steered independently, so issue the commands
+        # together and wait once for the slowest
+        steered = [self._pool.submit(self.switch.set_state,
+                                     str(SWout+1), SWin+SWout+1)
+                   for SWout in range(2)]
+        for future in steered:
+          future.result()
+        # the switch was re-steered so the cached levels are stale
+        self._adc_cache.clear()
+        ADC_levels = self._read_ADC_stat(dtype)
+        ADCin[SWin]   = ADC_levels['roach1']['IF1pwr']
+        ADCin[SWin+1] = ADC_levels['roach2']['IF2pwr']
     else:
       # assume 'kurt_spec' with two IFs per ROACH
       for SWin in range(0,24,4):
-        for SWout in range(0,4):
-          self.switch.set_state(str(SWout+1), SWin+SWout+1)
-        ADC_levels = self.check_ADC_inputs()
-        ADCin[SWin]   = ADC_levels['roach1']['Ro1In1'][dtype]
-        ADCin[SWin+1] = ADC_levels['roach1']['Ro1In2'][dtype]
-        ADCin[SWin+2] = ADC_levels['roach2']['Ro2In1'][dtype]
-        ADCin[SWin+3] = ADC_levels['roach2']['Ro2In2'][dtype]
-    self.logger.info("survey_ADC_inputs: %s", ADCin)
+        # the outputs are steered independently, so issue the commands
+        # together and wait once for the slowest
+        steered = [self._pool.submit(self.switch.set_state,
+                                     str(SWout+1), SWin+SWout+1)
+                   for SWout in range(0,4)]
+        for future in steered:
+          future.result()
+        # the switch was re-steered so the cached levels are stale
+        self._adc_cache.clear()
+        ADC_levels = self._read_ADC_stat(dtype)
+        ADCin[SWin]   = ADC_levels['roach1']['Ro1In1']
+        ADCin[SWin+1] = ADC_levels['roach1']['Ro1In2']
+        ADCin[SWin+2] = ADC_levels['roach2']['Ro2In1']
+        ADCin[SWin+3] = ADC_levels['roach2']['Ro2In2']
+    if self.logger.isEnabledFor(logging.INFO):
+      self.logger.info("survey_ADC_inputs: %s", ADCin)
     return ADCin
 
   def survey_input_spectra(self, moment=2):
@@ -258,16 +425,36 @@ class DTO_Manager(PyroServer):
       22: array([  2605225.,    826109.,    ...,    542307.,    692218.]),
       23: array([    37307.,      2800.,    ...,      1693.,       522.])}
     """
+    if hasattr(self.spectrometer, 'run_spectra_survey'):
+      # backends which can drive the sweep themselves do the whole
+      # 24-input scan locally and return it in one round trip
+      return self.spectrometer.run_spectra_survey(moment)
     data = {}
     for SWin in range(0,24,4):
-      for SWout in range(0,4):
-        self.switch.set_state(str(SWout+1), SWin+SWout+1)
+      # steer the four outputs together, then fetch the four spectra
+      # together; the transfers go to different ROACHes so they overlap
+      steered = [self._pool.submit(self.switch.set_state,
+                                   str(SWout+1), SWin+SWout+1)
+                 for SWout in range(0,4)]
+      for future in steered:
+        future.result()
+      futures = {}
+      for SWout, roach, rf in _KURT_DISPATCH:
         index = SWin+SWout
-        roachID = 1 + SWout % 2
-        RFid = 1 + SWout // 2
-        roach = "roach"+str(roachID)
-        rf = "Ro"+str(roachID)+"In"+str(RFid)
-        data[index] = self.RFchannel[roach][rf].get_accums()[moment]
+        channel = self.RFchannel[roach][rf]
+        if hasattr(channel, 'get_accums_f32'):
+          # newest firmware servers also downcast to float32 on their
+          # side, halving the bytes on the wire for the selected moment
+          futures[index] = self._pool.submit(channel.get_accums_f32, moment)
+        elif hasattr(channel, 'get_accum_moment'):
+          # newer firmware servers can select the moment remotely, which
+          # moves one array over the wire instead of all of them
+          futures[index] = self._pool.submit(channel.get_accum_moment, moment)
+        else:
+          futures[index] = self._pool.submit(
+                                  lambda chl=channel: chl.get_accums()[moment])
+      for index in futures.keys():
+        data[index] = futures[index].result()
     return data
   
   def update_gains(self):
@@ -279,10 +466,16 @@ class DTO_Manager(PyroServer):
       Out[20]: {'roach1': {'Ro1In1': 20.0, 'Ro1In2': 20.0},
                 'roach2': {'Ro2In1': 20.0, 'Ro2In2': 20.0}}
     """
-    for name in self.DSPnames:
-      for RF in self.RFchannel[name].keys():
-        self.gain[name][RF] = self.RFchannel[name][RF].RF_gain_get()
-        self.enabled[name][RF] = self.RFchannel[name][RF].RF_enabled()
+    # two remote reads per channel; dispatch them all together and write
+    # the results into the flat state arrays in place
+    futures = {(name, RF):
+                 (self._pool.submit(self.RFchannel[name][RF].RF_gain_get),
+                  self._pool.submit(self.RFchannel[name][RF].RF_enabled))
+               for name, RF in self._all_rf}
+    for chan, (gain_future, enabled_future) in futures.items():
+      index = self._chan_index[chan]
+      self._gain_arr[index] = gain_future.result()
+      self._enabled_arr[index] = enabled_future.result()
     return self.gain
   
   def RF_enabled(self):
@@ -322,15 +515,16 @@ class DTO_Manager(PyroServer):
       get_active_channels
           Returns a list of switch inputs connected to IF channels
     """
-    mkeys = DTO_Manager.__dict__.keys()
-    report = {}
-    for key in mkeys:
-      if key[:2] == "__":
-        continue
-      else:
-        report[key] = DTO_Manager.__dict__[key].__doc__
-    return report
-    
+    return self._HELP_METHODS
+
+# the class does not change at run time, so the method help is collected
+# once here instead of scanning the class dict on every request; a plain
+# dict, because the table is returned over Pyro and a mappingproxy does
+# not pickle
+DTO_Manager._HELP_METHODS = {key: value.__doc__
+                             for key, value in DTO_Manager.__dict__.items()
+                             if not key.startswith("__") and callable(value)}
+
 if __name__ == "__main__":
   from socket import gethostname
   __name__ = 'DTO_manager'
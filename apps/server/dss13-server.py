@@ -7,11 +7,10 @@ from support.logs import init_logging, get_loglevel, set_loglevel
 from MonitorControl.Configurations import station_configuration
 from MonitorControl.config_test import show_signal_path
 
-logging.basicConfig(level=logging.INFO)
-
 logpath = "/tmp/" # for now
 
 if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
 
   mylogger = logging.getLogger()
   init_logging(mylogger,
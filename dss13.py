@@ -8,24 +8,66 @@ Documents::
   2 Load and Diode Control-DSS13.pdf                           dated 
   3 4X16 Switch-1.pdf                                          dated 2011-08-24
 """
+import functools
 import re
 import logging
 module_logger = logging.getLogger(__name__)
 
+# the logger name for each class is fixed, so the loggers are fetched
+# once here instead of under the logging manager's lock on every
+# construction
+_LOGGERS = {name: logging.getLogger(f"{__name__}.{name}")
+            for name in ("DSNfe", "XXKa_fe", "XwideFE", "DSN_K", "DSNrx",
+                         "GSSRdc", "Kdc", "MMS", "XXKa", "HP_IFSwitch",
+                         "HP_IFSwitch.Channel", "IFMatrixSwitch", "WVSR")}
+
 from MonitorControl import Beam, ComplexSignal, IF, Device, Observatory, Port
-from MonitorControl import Switch, ClassInstance, Telescope
+from MonitorControl import ObservatoryError, Switch, ClassInstance, Telescope
 from MonitorControl import valid_property, link_ports
 from MonitorControl.FrontEnds import FrontEnd
 from MonitorControl.Receivers import Receiver
 from MonitorControl.BackEnds import Backend
 from MonitorControl.Switches.Ellipsoid13.client import Ellipsoid
 
+# the matrix switch output names never change, so they are built once at
+# import time
+_IFMS_OUTPUTS = tuple(f'out{n:02d}' for n in range(1,25))
+
 def make_IFMS_outputs():
-  names = []
-  for n in range(1,25):
-    names.append('out%02d' % n)
-  return names
-    
+  # Device.__init__ only iterates the names, so the shared tuple is safe
+  return _IFMS_OUTPUTS
+
+# cabling of the pedestal IF switch, one entry per input J100-J115; each
+# entry names the receiver and its output port, or None if the jack is
+# not connected
+_PEDESTAL_WIRING = (None,                 # J100
+                    ('XXKa',    'XRU'),   # J101
+                    ('X-X/Ka',  'XLU'),   # J102
+                    ('GSSR',    'XRU'),   # J103
+                    ('X-X/Ka',  'XRU'),   # J104
+                    ('X-S/X',   'XRU'),   # J105
+                    None,                 # J106
+                    ('GSSR',    'XLU'),   # J107
+                    ('Ka-X/Ka', 'KaLU'),  # J108
+                    ('XXKa',    'XLU'),   # J109
+                    None,                 # J110
+                    ('MMS-1',   'U'),     # J111
+                    ('Ka-X/Ka', 'KaRU'),  # J112
+                    ('S-S/X',   'SRU'),   # J113
+                    ('K',       'U'),     # J114
+                    None)                 # J115
+
+# output-name sets reused by station_configuration; tuples, so one
+# constant is shared by every call
+_ELLIPSOID_OUTS = ('pos1','pos2','pos3','pos4','pos5','pos6')
+_X_POLS    = ('XR', 'XL')
+_KA_POLS   = ('KaR', 'KaL')
+_XXKA_OUTS = _X_POLS + _KA_POLS
+_XLR_IFS   = ('XLU', 'XRU')
+_KA_IFS    = ('KaLU', 'KaRU')
+_XXKA_IFS  = ('XRU', 'XLU', 'KaRU', 'KaLU')
+_SW1_OUTS  = ('IF0', 'IF1', 'IF2', 'IF3')
+
 # ================================== Front Ends ===============================
     
 class DSNfe(FrontEnd):
@@ -79,7 +121,7 @@ class DSNfe(FrontEnd):
     @param active : True is the FrontEnd instance is functional
     @type  active : bool
     """
-    mylogger = logging.getLogger(module_logger.name+".DSNfe")
+    mylogger = _LOGGERS["DSNfe"]
     mylogger.debug(" initializing FrontEnd %s", self)
     band, output_names, pols_out = get_FE_band_and_pols(inputs,
                                                         band=band,
@@ -107,11 +149,12 @@ class XXKa_fe(FrontEnd):
   def __init__(self, name, inputs=None, output_names=None, active=True):
     """
     """
-    mylogger = logging.getLogger(module_logger.name+".XXKa_fe")
+    mylogger = _LOGGERS["XXKa_fe"]
     FrontEnd.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
     self.logger.debug(" initialized  for %s",self)
                       
 class XwideFE(FrontEnd):
@@ -122,11 +165,12 @@ class XwideFE(FrontEnd):
                output_names=None, active=True):
     """
     """
-    mylogger = logging.getLogger(module_logger.name+".XwideFE")
+    mylogger = _LOGGERS["XwideFE"]
     FrontEnd.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
 
 class DSN_K(FrontEnd):
   """
@@ -138,24 +182,28 @@ class DSN_K(FrontEnd):
     """
     
     """
-    mylogger = logging.getLogger(module_logger.name+".DSN_K")
+    mylogger = _LOGGERS["DSN_K"]
     FrontEnd.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
+    dbg = self.logger.isEnabledFor(logging.DEBUG)
     # It's not clear to me why I don't use DSN_fe.
-    for key in list(self.inputs.keys()):
-      self.logger.debug("__init__: %s signal source is %s",
-                        self.inputs[key], self.inputs[key].source)
-      self.inputs[key].signal = self.inputs[key].source.signal
-      self.logger.debug("__init__: %s input signal is %s", self,
-                        self.inputs[key].signal)
-      if self.inputs[key].signal == None:
-        self.inputs[key].signal = Beam('none')
-      self.inputs[key].signal.data['band'] = 'K'
     link_ports(self.inputs,self.outputs)
-    for key in list(self.outputs.keys()):
-      self.outputs[key].signal = ComplexSignal(self.outputs[key].source.signal)
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    # one pass over the paired ports instead of one loop per direction
+    for in_port, out_port in zip(self.inputs.values(), self.outputs.values()):
+      if dbg:
+        self.logger.debug("__init__: %s signal source is %s",
+                          in_port, in_port.source)
+      signal = in_port.source.signal
+      if signal is None:
+        signal = Beam('none')
+      in_port.signal = signal
+      if dbg:
+        self.logger.debug("__init__: %s input signal is %s", self, signal)
+      signal.data['band'] = 'K'
+      out_port.signal = ComplexSignal(out_port.source.signal)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
 
 # ---------------------------------- Receivers --------------------------------
 
@@ -191,20 +239,23 @@ class DSNrx(Receiver):
     @param active : True is the FrontEnd instance is functional
     @type  active : bool
     """
-    mylogger = logging.getLogger(module_logger.name+".DSNrx")
+    mylogger = _LOGGERS["DSNrx"]
     IF_out = get_receiver_IF_output_types(output_names)
     Receiver.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
     
-    # Having the band and pol in the output name is helpful but not required.
-    valid_property(output_names, 'band', abort=False)
-    valid_property(output_names, 'pol', abort=False)
+    # Having the band and pol in the output name is helpful but not
+    # required; the checks are advisory only, so 'python -O' skips them
+    if __debug__:
+      _check_property(tuple(output_names), 'band')
+      _check_property(tuple(output_names), 'pol')
     
     self.outputs = connect_receiver_inputs_and_outputs(self.inputs,
                                                        self.outputs,
                                                        IF_out)
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
 
 class GSSRdc(Receiver):
   """
@@ -212,12 +263,13 @@ class GSSRdc(Receiver):
   def __init__(self, name, inputs=None, output_names=None, active=True):
     """
     """
-    mylogger = logging.getLogger(module_logger.name+".GSSRdc")
+    mylogger = _LOGGERS["GSSRdc"]
     Receiver.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
     #self.name = name
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
 
 class Kdc(Receiver):
   """
@@ -227,32 +279,28 @@ class Kdc(Receiver):
     """
     This receiver has two inputs and two outputs
     """
-    mylogger = logging.getLogger(module_logger.name+".Kdc")
+    mylogger = _LOGGERS["Kdc"]
     Receiver.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
-    inkeys = list(self.inputs.keys())
-    inkeys.sort()
-    outkeys = list(self.outputs.keys())
-    outkeys.sort()
-    self.chan = {}
-    for key in inkeys:
-      index = inkeys.index(key)
-      outname = outkeys[index]
-      ch_inputs = {key: self.inputs[key]}
-      self.chan[key] = Receiver.RFsection(self, key, inputs=ch_inputs,
-                                                        output_names=[outname])
-      link_ports(ch_inputs, self.chan[key].outputs)
-      for chkey in list(self.chan[key].outputs.keys()):
-        self.outputs[chkey] = self.chan[key].outputs[chkey]
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+    # pair each input with its output by sorted position
+    input_to_output = dict(zip(sorted(self.inputs), sorted(self.outputs)))
+    self.chan = {key: Receiver.RFsection(self, key,
+                                         inputs={key: self.inputs[key]},
+                                         output_names=[outname])
+                 for key, outname in input_to_output.items()}
+    for key, channel in self.chan.items():
+      link_ports({key: self.inputs[key]}, channel.outputs)
+      self.outputs.update(channel.outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
 
 class MMS(Receiver):
   """
   """
   def __init__(self, name, inputs=None,
                       output_names=[], active=False):
-    mylogger = logging.getLogger(module_logger.name+".Kdc")
+    mylogger = _LOGGERS["Kdc"]
     Receiver.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
@@ -280,30 +328,27 @@ class XXKa(Receiver):
     
     @param active : receiver is available AND WORKING IF True
     """
-    mylogger = logging.getLogger(module_logger.name+".XXKa")
+    mylogger = _LOGGERS["XXKa"]
     Receiver.__init__(self, name, inputs=inputs,
                       output_names=output_names, active=active)
     self.logger = mylogger
     
-    if inputs == []:
-      raise 
-      inkeys = list(self.inputs.keys())
-      inkeys.sort()
-      outkeys = list(self.outputs.keys())
-      outkeys.sort()
-      self.chan = {}
-      for key in inkeys:
-        index = inkeys.index(key)
-        outname = outkeys[index]
-        ch_inputs = {key: self.inputs[key]}
+    if not inputs:
+      raise ObservatoryError(name, "XXKa receiver requires inputs")
+    dbg = self.logger.isEnabledFor(logging.DEBUG)
+    input_to_output = dict(zip(sorted(self.inputs), sorted(self.outputs)))
+    self.chan = {}
+    for key, outname in input_to_output.items():
+      ch_inputs = {key: self.inputs[key]}
+      if dbg:
         self.logger.debug("__init__: %s inputs: %s", key, ch_inputs)
         self.logger.debug("__init__: %s output: %s", key, outname)
-        self.chan[key] = Receiver.RFsection(self, key, inputs=ch_inputs,
-                                                        output_names=[outname])
+      self.chan[key] = Receiver.RFsection(self, key, inputs=ch_inputs,
+                                                      output_names=[outname])
       link_ports(ch_inputs, self.chan[key].outputs)
-      for chkey in list(self.chan[key].outputs.keys()):
-        self.outputs[chkey] = self.chan[key].outputs[chkey]
-    self.logger.debug("__init__: outputs: %s", self.outputs)
+      self.outputs.update(self.chan[key].outputs)
+    if self.logger.isEnabledFor(logging.DEBUG):
+      self.logger.debug("__init__: outputs: %s", self.outputs)
         
 
 # ===================================== Switches ==============================
@@ -341,24 +386,22 @@ class HP_IFSwitch(Device):
   def __init__(self, name, inputs=None, output_names=[], active=True):
     """
     """
-    mylogger = logging.getLogger(module_logger.name+".HP_IFSwitch")
-    mylogger.debug("__init__: inputs: %s", inputs)
+    mylogger = _LOGGERS["HP_IFSwitch"]
+    if mylogger.isEnabledFor(logging.DEBUG):
+      mylogger.debug("__init__: inputs: %s", inputs)
     Device.__init__(self, name, inputs=inputs, output_names=output_names,
                     active=active)
     self.logger = mylogger
     self.logger.debug("__init__: superclass Device initialized")
-    input_names = list(inputs.keys())
-    input_names.sort()
+    input_values = [inputs[name] for name in sorted(inputs)]
     self.channel = {}
     self.states = {}
-    for key in output_names:
-      index = output_names.index(key)
+    for index, key in enumerate(output_names):
       start = index*4
-      end = start+3
-      ch_inputs = {}
-      for inp in range(4):
-        ch_inputs[inp] = inputs[input_names[index+inp]]
-      self.logger.debug("__init__: channel inputs: %s", ch_inputs)
+      # each channel takes the next block of four inputs
+      ch_inputs = dict(enumerate(input_values[start:start+4]))
+      if self.logger.isEnabledFor(logging.DEBUG):
+        self.logger.debug("__init__: channel inputs: %s", ch_inputs)
       self.channel[key] = self.Channel(self, key, inputs=ch_inputs,
                                        output_names=[key])
       self.states[key] = self.channel[key].state
@@ -366,16 +409,21 @@ class HP_IFSwitch(Device):
   class Channel(Switch):
     """
     """
+    # the attributes added over the Switch base; the slots keep the many
+    # channel instances from each carrying their own attribute dict
+    __slots__ = ('parent', 'logger')
+    # every channel of this switch selects one of its inputs
+    stype = "Nx1"
+
     def __init__(self, parent, name, inputs=None, output_names=[]):
       self.parent = parent
-      self.stype = "Nx1"
-      mylogger = logging.getLogger(parent.logger.name+".Channel")
-      mylogger.debug("__init__: inputs: %s", inputs)
+      mylogger = _LOGGERS["HP_IFSwitch.Channel"]
+      if mylogger.isEnabledFor(logging.DEBUG):
+        mylogger.debug("__init__: inputs: %s", inputs)
       Switch.__init__(self, name, inputs=inputs, output_names=output_names,
                       stype = self.stype)
       self.logger = mylogger
-      for port in list(self.outputs.keys()):
-        self.parent.outputs[port] = self.outputs[port]
+      self.parent.outputs.update(self.outputs)
       self.get_state()
 
 
@@ -385,12 +433,12 @@ class IFMatrixSwitch(Device):
   def __init__(self, name, inputs=None, output_names=[], active=True):
     """
     """
-    mylogger = logging.getLogger(module_logger.name+".IFMatrixSwitch")
+    mylogger = _LOGGERS["IFMatrixSwitch"]
     Device.__init__(self, name, inputs=inputs, output_names=output_names,
                     active=active)
     self.logger = mylogger
     self.channel = {}
-    for key in list(self.inputs.keys()):
+    for key in self.inputs:
       self.channel[key] = self.Channel(self, key,
                                        inputs={key: self.inputs[key]},
                                        output_names=output_names)
@@ -398,17 +446,19 @@ class IFMatrixSwitch(Device):
   class Channel(Switch):
     """
     """
+    __slots__ = ('parent',)
+    # every channel of this switch fans its input out to the outputs
+    stype = "1xN"
+
     def __init__(self, parent, name, inputs=None, output_names=[],
                  active=True):
       """
       """
       self.parent = parent
       #self.name = name
-      self.stype = "1xN"
       Switch.__init__(self, name, inputs=inputs, output_names=output_names,
                       stype = self.stype)
-      for port in list(self.outputs.keys()):
-        self.parent.outputs[port] = self.outputs[port]
+      self.parent.outputs.update(self.outputs)
 
 # =================================== Back Ends ===============================
 
@@ -419,12 +469,38 @@ class WVSR(Backend):
     """
     """
     #self.name = name
-    mylogger = logging.getLogger(module_logger.name+".WVSR")
+    mylogger = _LOGGERS["WVSR"]
     Backend.__init__(self, name, inputs=inputs, output_names=output_names)
     self.logger = mylogger
 
 # =================================== functions ===============================
 
+# The name parsing below is pure string work on small tuples of port
+# names, and the same names recur every time a configuration is rebuilt,
+# so the 'valid_property' scans are memoized on the name tuples.
+
+# anchored alternation over the valid band codes; 'Ka' must precede 'K'
+# so the two-letter code wins
+_BAND_RE = re.compile(r'(S|X|Ka|K|L|C|Q|W)')
+
+@functools.lru_cache(maxsize=128)
+def _parse_input_bands(input_keys):
+  bands = {key: match.group(1) for key in input_keys
+                               for match in [_BAND_RE.match(key)] if match}
+  return bands or False
+
+@functools.lru_cache(maxsize=128)
+def _parse_output_pols(output_names):
+  return valid_property(list(output_names), 'pol_type')
+
+@functools.lru_cache(maxsize=128)
+def _parse_IF_types(output_names):
+  return valid_property(list(output_names), 'IF_type')
+
+@functools.lru_cache(maxsize=128)
+def _check_property(output_names, prop):
+  return valid_property(list(output_names), prop, abort=False)
+
 def get_FE_band_and_pols(inputs, band=None, pols_out=None, output_names=[]):
   """
   This extracts band and polarization information from the input and output
@@ -454,32 +530,34 @@ def get_FE_band_and_pols(inputs, band=None, pols_out=None, output_names=[]):
   
   @return: (band, output names, output polarization)
   """
+  dbg = module_logger.isEnabledFor(logging.DEBUG)
   # Make sure that the band is specified
-  input_keys = list(inputs.keys())
-  input_keys.sort()
-  module_logger.debug("get_FE_band_and_pols: inputs: %s", input_keys)
-  if band == None:
-    bands = valid_property(input_keys, 'band')
+  input_keys = sorted(inputs)
+  if dbg:
+    module_logger.debug("get_FE_band_and_pols: inputs: %s", input_keys)
+  if band is None:
+    bands = _parse_input_bands(tuple(input_keys))
     if bands == False:
       raise ObservatoryError('band',' property key not found')
-    band = bands[list(bands.keys())[0]]
-    module_logger.debug('get_FE_band_and_pols: band is %s', band)
+    band = next(iter(bands.values()))
+    if dbg:
+      module_logger.debug('get_FE_band_and_pols: band is %s', band)
     if len(inputs) > 1:
       # check that all bands are the same
-      if not (bands==band).all():
+      if set(bands.values()) != {band}:
         raise ObservatoryError(str(band),'is not in every input name')
   # Having the band in the output name is helpful but not required.
   #valid_property(output_names, 'band', abort=False)
   # Make sure that the output polarizations are specified
-  if pols_out == None and output_names == None:
+  if pols_out is None and output_names is None:
     raise ObservatoryError("No outputs specified")
   elif pols_out:
-    output_names = list(pols_out.keys())
-    output_names.sort()
+    output_names = sorted(pols_out)
   else:
-     pols_out = valid_property(output_names, 'pol_type')
-  module_logger.debug("get_FE_band_and_pols: output_names=%s", output_names)
-  module_logger.debug("get_FE_band_and_pols: pols_out: %s",pols_out)
+     pols_out = _parse_output_pols(tuple(output_names))
+  if dbg:
+    module_logger.debug("get_FE_band_and_pols: output_names=%s", output_names)
+    module_logger.debug("get_FE_band_and_pols: pols_out: %s",pols_out)
   return band, output_names, pols_out
 
 def connect_FE_inputs_and_outputs(inputs, band, outputs, pols_out):
@@ -506,26 +584,30 @@ def connect_FE_inputs_and_outputs(inputs, band, outputs, pols_out):
   @return: modified outputs
   """
   # connect the inputs and outputs
-  output_names = list(outputs.keys())
-  output_names.sort()
+  output_names = sorted(outputs)
   if len(inputs) == 1:
     link_ports(inputs, outputs)
   else:
     assert len(inputs) == len(outputs), \
                       "number of output groups must equal the number of inputs"
+    dbg = module_logger.isEnabledFor(logging.DEBUG)
+    input_keys = sorted(inputs)
+    out_index = {name: index for index, name in enumerate(output_names)}
     for item in pols_out:
-      module_logger.debug("connect_FE_inputs_and_outputs: processing %s", item)
-      index = output_names.index(item)
-      link_ports(inputs[input_keys[index]], item)
+      if dbg:
+        module_logger.debug("connect_FE_inputs_and_outputs: processing %s",
+                            item)
+      index = out_index[item]
+      link_ports({input_keys[index]: inputs[input_keys[index]]},
+                 {item: outputs[item]})
   # Specify the output signals
-  for key in list(outputs.keys()):
-    if outputs[key].signal == None:
+  for key in outputs:
+    if outputs[key].signal is None:
       outputs[key].signal = ComplexSignal(None, name=key, pol=pols_out[key])
     else:
       outputs[key].signal = ComplexSignal(outputs[key].source.signal, name=key,
                                           pol=pols_out[key])
-    outputs[key].signal.data['band'] = band
-    outputs[key].signal.data['pol'] = pols_out[key]
+    outputs[key].signal.data.update({'band': band, 'pol': pols_out[key]})
   return outputs
 
 def get_receiver_IF_output_types(output_names):
@@ -540,9 +622,9 @@ def get_receiver_IF_output_types(output_names):
   @return: list of str
   """
   # Make sure that the output IF types are specified
-  if output_names == None:
+  if output_names is None:
     raise ObservatoryError("No outputs specified")
-  IF_out = valid_property(output_names, 'IF_type')
+  IF_out = _parse_IF_types(tuple(output_names))
   module_logger.debug("__init__: IF_out: %s",IF_out)
   return IF_out
 
@@ -566,31 +648,84 @@ def connect_receiver_inputs_and_outputs(inputs, outputs, IF_out):
   
   @return: modified outputs
   """
-  output_names = list(outputs.keys())
-  output_names.sort()
+  output_names = sorted(outputs)
   # connect the inputs and outputs
   if len(inputs) == 1:
     link_ports(inputs, outputs)
   else:
     assert len(inputs) == len(outputs), \
                       "number of output groups must equal the number of inputs"
-    input_keys = list(inputs.keys())
-    input_keys.sort()
-    module_logger.debug(" input keys: %s", input_keys)
+    dbg = module_logger.isEnabledFor(logging.DEBUG)
+    input_keys = sorted(inputs)
+    if dbg:
+      module_logger.debug(" input keys: %s", input_keys)
+    out_index = {name: index for index, name in enumerate(output_names)}
     for item in IF_out:
-      module_logger.debug("connect_receiver_inputs_and_outputs: processing %s",
-                          item)
-      index = output_names.index(item)
+      if dbg:
+        module_logger.debug(
+                         "connect_receiver_inputs_and_outputs: processing %s",
+                         item)
+      index = out_index[item]
       link_ports({input_keys[index]: inputs[input_keys[index]]},
                  {item: outputs[item]})
   # Specify the output signals
-  for key in list(outputs.keys()):
-    if outputs[key].signal == None:
+  for key in outputs:
+    if outputs[key].signal is None:
       outputs[key].signal = IF(None, IF_type=IF_out[key])
     else:
       outputs[key].signal = IF(outputs[key].source.signal, IF_type=IF_out[key])
   return outputs
     
+# Declarative wiring of the DSS-13 front ends: name, implementation,
+# ellipsoid position, input port names (all fed from that position) and
+# output names.  This comes from document 1 (see Documentation).
+_FE_SPECS = (('X-X/Ka',  DSNfe,   'pos1', ('X',),      _X_POLS),
+             ('Ka-X/Ka', DSNfe,   'pos1', ('Ka',),     _KA_POLS),
+             ('S-S/X',   DSNfe,   'pos2', ('S',),      ('SR',)),
+             ('X-S/X',   DSNfe,   'pos2', ('X',),      ('XR',)),
+             ('XXKa',    XXKa_fe, 'pos3', ('X', 'Ka'), _XXKA_OUTS),
+             ('Xwide',   DSNfe,   'pos4', ('X',),      _X_POLS),
+             ('K',       DSN_K,   'pos5', ('K',),      ('out',)))
+
+# the receivers: name, implementation, the front end feeding them, the
+# (receiver port, front end port) pairs and the output names
+_RX_SPECS = (('S-S/X',   DSNrx,  'S-S/X',   (('SR', 'SR'),),   ('SRU',)),
+             ('X-S/X',   DSNrx,  'X-S/X',   (('XR', 'XR'),),   ('XRU',)),
+             ('X-X/Ka',  DSNrx,  'X-X/Ka',  (('XR', 'XR'),
+                                             ('XL', 'XL')),    _XLR_IFS),
+             ('Ka-X/Ka', DSNrx,  'Ka-X/Ka', (('KaL', 'KaL'),
+                                             ('KaR', 'KaR')),  _KA_IFS),
+             ('XXKa',    DSNrx,  'XXKa',    (('XR', 'XR'),
+                                             ('XL', 'XL'),
+                                             ('KaR', 'KaR'),
+                                             ('KaL', 'KaL')),  _XXKA_IFS),
+             ('GSSR',    GSSRdc, 'Xwide',   (('XL', 'XL'),
+                                             ('XR', 'XR')),    _XLR_IFS),
+             ('K',       Kdc,    'K',       (('in', 'out'),),  ('U',)),
+             ('MMS-1',   MMS,    None,      (),                ('U',)))
+
+class _LazyEquipDict(dict):
+  """
+  Equipment dict which constructs each device on first access
+
+  The values are created by factories registered at initialization; a
+  lookup of a key which has not been built yet runs its factory and
+  caches the instance.  Signal chains which are never referenced are
+  never constructed, with all their port-linking and logging cost.
+  """
+  def __init__(self, factories):
+    """
+    @param factories : callables, one per key, returning the device
+    @type  factories : dict of callables
+    """
+    dict.__init__(self)
+    self._factories = factories
+
+  def __missing__(self, key):
+    value = self._factories[key]()
+    self[key] = value
+    return value
+
 def station_configuration(equipment, roach_loglevel=logging.WARNING):
   """
   DSS-13 configuration
@@ -607,91 +742,56 @@ def station_configuration(equipment, roach_loglevel=logging.WARNING):
   equipment['Telescope'] = tel
   equipment['FE_selector'] = ClassInstance(Switch, Ellipsoid, "ellipsoid",
                                inputs={'antenna': tel.outputs[tel.name]},
-                               output_names=['pos1','pos2','pos3','pos4',
-                                             'pos5','pos6'])
+                               output_names=_ELLIPSOID_OUTS)
   # The following information comes from document 1 (see Documentation).
   # Generally, the implicit band and polarization specification (i.e. in the
   # name) since most receivers are named conveniently.
-  FEs = {'X-X/Ka': ClassInstance(FrontEnd, DSNfe, 'X-X/Ka',
-                   inputs={'X': equipment['FE_selector'].outputs['pos1']},
-                   output_names=['XR', 'XL']),
-         'Ka-X/Ka': ClassInstance(FrontEnd, DSNfe, 'Ka-X/Ka',
-                  inputs={'Ka': equipment['FE_selector'].outputs['pos1']},
-                  output_names=['KaR', 'KaL']),
-         'S-S/X': ClassInstance(FrontEnd, DSNfe, 'S-S/X',
-                       inputs={'S':  equipment['FE_selector'].outputs['pos2']},
-                       output_names=['SR']),
-         'X-S/X': ClassInstance(FrontEnd, DSNfe, 'X-S/X',
-                       inputs={'X':  equipment['FE_selector'].outputs['pos2']},
-                       output_names=['XR']),
-         'XXKa': ClassInstance(FrontEnd, XXKa_fe, 'XXKa',
-                 inputs={'X':  equipment['FE_selector'].outputs['pos3'],
-                         'Ka': equipment['FE_selector'].outputs['pos3']},
-                 output_names=['XR', 'XL', 'KaR', 'KaL']),
-         'Xwide': ClassInstance(FrontEnd, DSNfe, 'Xwide',
-                        inputs={'X': equipment['FE_selector'].outputs['pos4']},
-                        output_names=['XR', 'XL']),
-         'K': ClassInstance(FrontEnd, DSN_K, 'K',
-                        inputs={'K': equipment['FE_selector'].outputs['pos5']},
-                        output_names=['out'])
-        }
+  # Each front end and receiver is built on first access.  Wiring the
+  # pedestal switch below forces all of them, so the laziness only pays
+  # off for callers that use the equipment dicts without the switch.
+  fe_sel = equipment['FE_selector']
+  def _fe_factory(name, impl, pos, in_names, out_names):
+    # the factory defers construction until the front end is first used
+    def build():
+      port = fe_sel.outputs[pos]
+      return ClassInstance(FrontEnd, impl, name,
+                           inputs={key: port for key in in_names},
+                           output_names=out_names)
+    return build
+  FEs = _LazyEquipDict({spec[0]: _fe_factory(*spec) for spec in _FE_SPECS})
   equipment['FrontEnd'] = FEs
   # No RF switch(es)
-  receivers = {'S-S/X': ClassInstance(Receiver, DSNrx, 'S-S/X',
-                                    inputs={'SR': FEs['S-S/X'].outputs['SR']},
-                                    output_names=['SRU']),
-               'X-S/X': ClassInstance(Receiver, DSNrx, 'X-S/X',
-                                    inputs={'XR': FEs['X-S/X'].outputs['XR']},
-                                    output_names=['XRU']),
-               'X-X/Ka': ClassInstance(Receiver, DSNrx, 'X-X/Ka',
-                                  inputs={'XR':  FEs['X-X/Ka'].outputs['XR'],
-                                          'XL':  FEs['X-X/Ka'].outputs['XL']},
-                                   output_names=['XLU','XRU']),
-               'Ka-X/Ka': ClassInstance(Receiver, DSNrx, 'Ka-X/Ka',
-                                 inputs={'KaL': FEs['Ka-X/Ka'].outputs['KaL'],
-                                         'KaR': FEs['Ka-X/Ka'].outputs['KaR']},
-                                    output_names=['KaLU','KaRU']),
-               'XXKa': ClassInstance(Receiver, DSNrx, 'XXKa',
-                                    inputs={'XR':  FEs['XXKa'].outputs['XR'],
-                                            'XL':  FEs['XXKa'].outputs['XL'],
-                                            'KaR': FEs['XXKa'].outputs['KaR'],
-                                            'KaL': FEs['XXKa'].outputs['KaL']},
-                                    output_names=['XRU','XLU','KaRU','KaLU']),
-               'GSSR': ClassInstance(Receiver, GSSRdc, 'GSSR',
-                                     inputs={'XL': FEs['Xwide'].outputs['XL'],
-                                             'XR': FEs['Xwide'].outputs['XR']},
-                                     output_names=['XLU', 'XRU']),
-               'K': ClassInstance(Receiver, Kdc, 'K',
-                                  inputs={'in': FEs['K'].outputs['out']},
-                                  output_names=['U']),
-               'MMS-1': ClassInstance(Receiver, MMS, 'MMS-1',
-                                      inputs=None, output_names=['U'])}
+  def _rx_factory(name, impl, fe_name, ports, out_names):
+    # looking the front end up inside the factory keeps unused chains
+    # (front end and receiver both) unbuilt
+    def build():
+      if fe_name is None:
+        inputs = None
+      else:
+        fe_outs = FEs[fe_name].outputs
+        inputs = {rx_port: fe_outs[fe_port] for rx_port, fe_port in ports}
+      return ClassInstance(Receiver, impl, name, inputs=inputs,
+                           output_names=out_names)
+    return build
+  receivers = _LazyEquipDict({spec[0]: _rx_factory(*spec)
+                              for spec in _RX_SPECS})
   equipment['Receiver'] = receivers
+  # the pedestal switch inputs follow the wiring table; unconnected jacks
+  # get None
+  pedestal_inputs = {100+num: (receivers[pair[0]].outputs[pair[1]] if pair
+                               else None)
+                     for num, pair in enumerate(_PEDESTAL_WIRING)}
   IFsw1 = ClassInstance(Device, HP_IFSwitch,
                         'Pedestal IF Switch',
-                           inputs={100: None,
-                                   101: receivers['XXKa'].outputs['XRU'],
-                                   102: receivers['X-X/Ka'].outputs['XLU'],
-                                   103: receivers['GSSR'].outputs['XRU'],
-                                   104: receivers['X-X/Ka'].outputs['XRU'],
-                                   105: receivers['X-S/X'].outputs['XRU'],
-                                   106: None,
-                                   107: receivers['GSSR'].outputs['XLU'],
-                                   108: receivers['Ka-X/Ka'].outputs['KaLU'],
-                                   109: receivers['XXKa'].outputs['XLU'],
-                                   110: None,
-                                   111: receivers['MMS-1'].outputs['U'],
-                                   112: receivers['Ka-X/Ka'].outputs['KaRU'],
-                                   113: receivers['S-S/X'].outputs['SRU'],
-                                   114: receivers['K'].outputs['U'],
-                                   115: None},
-                           output_names=['IF0','IF1','IF2','IF3'])
+                           inputs=pedestal_inputs,
+                           output_names=_SW1_OUTS)
+  sw1_outs = IFsw1.outputs
   IFsw2 = ClassInstance(Device, IFMatrixSwitch,
                                     'Station IF Switch',
-                               inputs={'IF0': IFsw1.outputs['IF0'],
-                                       'IF1': IFsw1.outputs['IF1'],
-                                       'IF2': IFsw1.outputs['IF2'],
-                                       'IF3': IFsw1.outputs['IF3']},
+                               inputs={'IF0': sw1_outs['IF0'],
+                                       'IF1': sw1_outs['IF1'],
+                                       'IF2': sw1_outs['IF2'],
+                                       'IF3': sw1_outs['IF3']},
                                output_names=make_IFMS_outputs())
   equipment['IF_switch'] = {'pedestal': IFsw1, 'control room': IFsw2}
   backends = {'WVSR': ClassInstance(Backend, WVSR, 'VenusWVSR',
@@ -30,6 +30,8 @@ from Electronics.Switches import JFW50MS287
 from Observatory.BackEnds.ROACH.roach import Roach, Spec
 from Observatory.BackEnds.ROACH.kurt_spec import KurtosisSpectrometer
 from Electronics.Instruments.synthesizers import Valon1,Valon2
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
 
 module_logger = logging.getLogger(__name__)
@@ -42,7 +44,30 @@ def trace_signals(FE_chl,DC):
     module_logger.debug(" DC[%s] signal source is %s",
                    key,str(DC[key].sources))
   
-def station_configuration(roach_loglevel=logging.WARNING):
+def station_configuration(roach_loglevel=logging.WARNING,
+                          force_rebuild=False):
+  """
+  Returns the lab test setup, building it on the first call
+
+  The Valon synthesizer handshakes and the ROACH connections dominate
+  the cost of building the configuration, so the object graph is built
+  once per log level and later calls return the same instances.  The
+  caller must treat the returned dicts as shared, not private copies.
+
+  @param roach_loglevel : log level for the ROACH loggers
+  @type  roach_loglevel : int
+
+  @param force_rebuild : discard cached configurations and build anew
+  @type  force_rebuild : bool
+
+  @return: class instances for hardware
+  """
+  if force_rebuild:
+    _build_station.cache_clear()
+  return _build_station(roach_loglevel)
+
+@functools.lru_cache(maxsize=4)
+def _build_station(roach_loglevel=logging.WARNING):
   """
   This is the test setup in the lab with simulated 'front ends' and
   'downconverters'::
@@ -113,18 +138,19 @@ def station_configuration(roach_loglevel=logging.WARNING):
   module_logger.debug(" roach2 sample clock is %f",
                  sample_clk[1].get_p("frequency"))
   # describe the backend input selector switches; real hardware this time
-  IFsw = {}
+  # every switch sees the same input wiring, so the list is built once
+  switch_inputs = [DC['RFI'],  None,None,None,
+                   DC['noise'],None,None,None,
+                   DC['tone'], None,None,None] + [None]*12
+  # each switch brings up its own serial link, so the four are
+  # constructed concurrently and the wall time is that of the slowest
+  with ThreadPoolExecutor(max_workers=4) as pool:
+    futures = {index: pool.submit(ClassInstance, Switch, JFW50MS287, lab,
+                                  index, inputs=switch_inputs)
+               for index in range(4)}
+    IFsw = {index: future.result() for index, future in futures.items()}
+  # the fix-ups append to the shared signal sources, so they stay serial
   for index in range(4):
-    IFsw[index] = ClassInstance(Switch,
-                                JFW50MS287,
-                                lab,
-                                index,
-                                inputs=[DC['RFI'],  None,None,None,
-                                        DC['noise'],None,None,None,
-                                        DC['tone'], None,None,None,
-                                        None,       None,None,None,
-                                        None,       None,None,None,
-                                        None,       None,None,None])
     state = IFsw[index].get_state()
     signal_source = IFsw[index].sources[0]
     module_logger.debug(" IFsw[%d] state is %d",index, state)
@@ -155,11 +181,11 @@ def station_configuration(roach_loglevel=logging.WARNING):
                                             'gpu1',
                                             10000)}
     # This so far assumes that there is only one ADC in ZDOC 0.
-    if spec.has_key(roach_num):
-      if spec[roach_num].has_key(0):
-        if spec[roach_num][0].has_key(RFnum):
-          spec[roach_num][0][RFnum].sources = [IFsw[index]]
-          IFsw[index].destinations = [spec[roach_num][0][RFnum]]
+    # Switch n feeds RF input n%2 of roach n//2 (see the diagram above).
+    for RF, be_chl in spec[roach_index].get(0, {}).items():
+      sw = IFsw[2*roach_index + RF]
+      be_chl.sources = [sw]
+      sw.destinations = [be_chl]
   # This set of loops only serves a diagnostic purposee.
   for roach_index in spec.keys():
     for ADC_index in spec[roach_index].keys():
@@ -180,15 +206,15 @@ def find_BE_channels(roach):
   """
   myspec = {}
   module_logger.debug("find_BE_channels: finding spec[%d]",roach.number)
-  ADC_keys = roach.ADC_inputs.keys()
-  if roach.BE_channels:
-    for ADC in ADC_keys:
+  be_channels = roach.BE_channels
+  if be_channels:
+    for ADC, RFs in roach.ADC_inputs.items():
       module_logger.debug("find_BE_channels: finding spec[%d][%d]",
                           roach.number,ADC)
       myspec[ADC] = {}
-      for RF in roach.ADC_inputs[ADC]:
+      for RF in RFs:
         module_logger.debug("find_BE_channels: finding spec[%d][%d][%d]",
                             roach.number,ADC,RF)
-        myspec[ADC][RF] = roach.BE_channels[ADC][RF]
+        myspec[ADC][RF] = be_channels[ADC][RF]
   module_logger.debug("find_BE_channels: Found instances: %s", str(myspec))
   return myspec